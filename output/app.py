@@ -1,92 +1,151 @@
+import asyncio
+import csv
 import gradio as gr
 import datetime
+import io
+import math
 from expenses import ExpenseManager, UserAccount, Expense
 
-# Initialize the expense manager with a default balance
-user_account = UserAccount(0)
-expense_manager = ExpenseManager(user_account)
 
+class AppState:
+    """
+    Holds the expense manager shared by all handlers, guarded by an asyncio lock.
 
-def set_initial_balance(initial_balance):
-    global user_account, expense_manager
+    The handlers run on Gradio's event loop, so waiting for the lock suspends the handler instead of blocking the loop.
+    """
+
+    def __init__(self):
+        # Initialize the expense manager with a default balance
+        self.manager = ExpenseManager(UserAccount(0))
+        self.lock = asyncio.Lock()
+
+    async def query(self, fn):
+        # Runs fn(manager) in a worker thread while holding the lock, so long reads never block the event loop
+        async with self.lock:
+            return await asyncio.to_thread(fn, self.manager)
+
+
+STATE = AppState()
+
+
+def _parse_date(s):
+    # Fixed YYYY-MM-DD input, so slice it directly instead of going through strptime
+    if len(s) != 10 or s[4] != "-" or s[7] != "-" or not (s[0:4] + s[5:7] + s[8:10]).isdigit():
+        raise ValueError(f"Invalid date '{s}'. Please use YYYY-MM-DD.")
+    return datetime.date(int(s[0:4]), int(s[5:7]), int(s[8:10]))
+
+async def set_initial_balance(initial_balance):
     try:
         initial_balance = float(initial_balance)
-        user_account = UserAccount(initial_balance)
-        expense_manager = ExpenseManager(user_account)
+        manager = ExpenseManager(UserAccount(initial_balance))
+        async with STATE.lock:
+            STATE.manager = manager
         return f"Initial balance set to: {initial_balance}"
     except ValueError:
         return "Invalid input. Please enter a number."
 
-def add_expense(amount, category, date, description):
-    global expense_manager
+async def add_expense(amount, category, date, description):
     try:
         amount = float(amount)
-        date = datetime.datetime.strptime(date, '%Y-%m-%d').date()
-        expense_manager.add_expense(amount, category, date, description)
-        return "Expense added successfully."
+        date = _parse_date(date)
+        async with STATE.lock:
+            expense_id = STATE.manager.add_expense(amount, category, date, description)
+        return f"Expense added successfully with id {expense_id}."
+    except ValueError as e:
+        return str(e)
+    except Exception as e:
+        return f"An error occurred: {e}"
+
+async def import_expenses(csv_text):
+    try:
+        rows = []
+        # One "amount,category,YYYY-MM-DD[,description]" expense per line
+        reader = csv.reader(io.StringIO(csv_text or ""))
+        for line in reader:
+            if not line:
+                continue
+            if len(line) < 3:
+                return f"Line {reader.line_num}: expected amount,category,YYYY-MM-DD[,description]."
+            amount, category, date, *rest = line
+            try:
+                amount = float(amount)
+                # Checked here as well as in Expense so the message can name the offending line
+                if not math.isfinite(amount) or amount <= 0:
+                    raise ValueError(f"Amount must be a positive number, got '{line[0]}'.")
+                rows.append((amount, category.strip(), _parse_date(date.strip()), ",".join(rest).strip()))
+            except ValueError as e:
+                return f"Line {reader.line_num}: {e}"
+        async with STATE.lock:
+            expense_ids = STATE.manager.add_expenses(rows)
+        return f"Imported {len(expense_ids)} expenses."
     except ValueError as e:
         return str(e)
     except Exception as e:
         return f"An error occurred: {e}"
 
-def update_expense(index, amount, category, date, description):
-    global expense_manager
+async def update_expense(expense_id, amount, category, date, description):
     try:
-        index = int(index)
+        expense_id = int(expense_id)
         amount = float(amount)
-        date = datetime.datetime.strptime(date, '%Y-%m-%d').date()
-        expense_manager.update_expense(index, amount, category, date, description)
+        date = _parse_date(date)
+        async with STATE.lock:
+            STATE.manager.update_expense(expense_id, amount, category, date, description)
         return "Expense updated successfully."
     except ValueError as e:
         return str(e)
     except IndexError:
-        return "Invalid expense index."
+        return "Invalid expense id."
     except Exception as e:
         return f"An error occurred: {e}"
 
-def delete_expense(index):
-    global expense_manager
+async def delete_expense(expense_id):
     try:
-        index = int(index)
-        expense_manager.delete_expense(index)
+        expense_id = int(expense_id)
+        async with STATE.lock:
+            STATE.manager.delete_expense(expense_id)
         return "Expense deleted successfully."
     except ValueError:
-        return "Invalid index. Please enter a number."
+        return "Invalid id. Please enter a number."
     except IndexError:
-        return "Invalid expense index."
+        return "Invalid expense id."
     except Exception as e:
         return f"An error occurred: {e}"
 
-def view_expenses(start_date, end_date):
-    global expense_manager
+async def view_expenses(start_date, end_date):
     try:
-        start_date = datetime.datetime.strptime(start_date, '%Y-%m-%d').date()
-        end_date = datetime.datetime.strptime(end_date, '%Y-%m-%d').date()
-        expenses = expense_manager.get_expenses_by_period(start_date, end_date)
-        output = ""
-        for expense in expenses:
-            output += f"{expense}\n"
-        if not output:
-            output = "No expenses found in the specified period."
-        return output
+        start_date = _parse_date(start_date)
+        end_date = _parse_date(end_date)
+        async with STATE.lock:
+            expenses = STATE.manager.get_expenses_by_period(start_date, end_date)
+        lines = [f"[{expense.expense_id}] {expense!r}" for expense in expenses]
+        return "\n".join(lines) if lines else "No expenses found in the specified period."
     except ValueError as e:
         return str(e)
     except Exception as e:
         return f"An error occurred: {e}"
 
-def generate_report(period):
-    global expense_manager
+async def generate_report(period):
     try:
-        report = expense_manager.generate_report(period)
+        today = datetime.date.today()
+        report = await STATE.query(lambda manager: manager.generate_report(period, today))
         return str(report)
     except ValueError as e:
         return str(e)
     except Exception as e:
         return f"An error occurred: {e}"
+
+async def get_totals_by_period(period):
+    try:
+        totals = await STATE.query(lambda manager: manager.get_totals_by_period(period))
+        lines = [f"{label}: {total}" for label, total in totals.items()]
+        return "\n".join(lines) if lines else "No expenses recorded."
+    except ValueError as e:
+        return str(e)
+    except Exception as e:
+        return f"An error occurred: {e}"
     
-def get_balance():
-     global expense_manager
-     return str(expense_manager.get_remaining_balance())
+async def get_balance():
+     return str(STATE.manager.get_remaining_balance())
 
 with gr.Blocks() as demo:
     gr.Markdown("# Simple Expense Manager")
@@ -106,21 +165,27 @@ with gr.Blocks() as demo:
         add_output = gr.Textbox(label="Output")
         add_button.click(add_expense, inputs=[amount_input, category_input, date_input.value, description_input], outputs=add_output)
         
+    with gr.Tab("Import CSV"):
+        csv_input = gr.Textbox(label="Expenses (amount,category,YYYY-MM-DD,description per line)", lines=8)
+        import_button = gr.Button("Import Expenses")
+        import_output = gr.Textbox(label="Output")
+        import_button.click(import_expenses, inputs=csv_input, outputs=import_output)
+
     with gr.Tab("Update Expense"):
-        index_input = gr.Number(label="Index of Expense to Update")
+        id_input = gr.Number(label="Id of Expense to Update")
         update_amount_input = gr.Number(label="New Amount")
         update_category_input = gr.Textbox(label="New Category")
         update_date_input = gr.DateTime(label="New Date")
         update_description_input = gr.Textbox(label="New Description", lines=2)
         update_button = gr.Button("Update Expense")
         update_output = gr.Textbox(label="Output")
-        update_button.click(update_expense, inputs=[index_input, update_amount_input, update_category_input, update_date_input, update_description_input], outputs=update_output)
+        update_button.click(update_expense, inputs=[id_input, update_amount_input, update_category_input, update_date_input, update_description_input], outputs=update_output)
 
     with gr.Tab("Delete Expense"):
-        delete_index_input = gr.Number(label="Index of Expense to Delete")
+        delete_id_input = gr.Number(label="Id of Expense to Delete")
         delete_button = gr.Button("Delete Expense")
         delete_output = gr.Textbox(label="Output")
-        delete_button.click(delete_expense, inputs=delete_index_input, outputs=delete_output)
+        delete_button.click(delete_expense, inputs=delete_id_input, outputs=delete_output)
 
     with gr.Tab("View Expenses"):
         start_date_input = gr.DateTime(label="Start Date")
@@ -133,7 +198,9 @@ with gr.Blocks() as demo:
         period_input = gr.Radio(["weekly", "monthly", "yearly"], label="Period")
         report_button = gr.Button("Generate Report")
         report_output = gr.Textbox(label="Report")
+        totals_output = gr.Textbox(label="Totals by Period")
         report_button.click(generate_report, inputs=period_input, outputs=report_output)
+        report_button.click(get_totals_by_period, inputs=period_input, outputs=totals_output)
 
     with gr.Tab("View Balance"):
         balance_button = gr.Button("Get Balance")
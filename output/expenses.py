@@ -1,5 +1,18 @@
+import bisect
 import datetime
-from typing import List, Dict, Tuple, Optional
+import math
+import sys
+from array import array
+from itertools import groupby
+from typing import List, Dict, Iterable, Set, Tuple, Optional
+
+
+# Maps a report period to the label of the bucket a date falls into. Labels are monotonic in the date.
+_PERIOD_BUCKETS = {
+    "weekly": lambda date: "%d-W%02d" % date.isocalendar()[:2],
+    "monthly": lambda date: f"{date.year}-{date.month:02d}",
+    "yearly": lambda date: str(date.year),
+}
 
 
 class Expense:
@@ -7,6 +20,8 @@ class Expense:
     Represents a single expense entry.
     """
 
+    __slots__ = ("amount", "category", "date", "description", "expense_id", "_repr_cache")
+
     def __init__(self, amount: float, category: str, date: datetime.date, description: str = "") -> None:
         """
         Initializes a new Expense object.
@@ -17,25 +32,50 @@ class Expense:
             date (datetime.date): The date of the expense.
             description (str, optional): A brief description of the expense. Defaults to "".
         """
-        if not isinstance(amount, (int, float)):
-            raise TypeError("Amount must be a number.")
-        if not isinstance(category, str):
-            raise TypeError("Category must be a string.")
-        if not isinstance(date, datetime.date):
-            raise TypeError("Date must be a datetime.date object.")
+        self.expense_id: Optional[int] = None
+        self.recycle(amount, category, date, description)
+
+    def recycle(self, amount: float, category: str, date: datetime.date, description: str = "") -> None:
+        """
+        Reinitializes the Expense object in place with new values, avoiding a fresh allocation.
+
+        The values are validated before anything is overwritten, so the object is left unchanged if they are invalid.
+
+        Args:
+            amount (float): The new amount of the expense.
+            category (str): The new category of the expense.
+            date (datetime.date): The new date of the expense.
+            description (str, optional): The new description of the expense. Defaults to "".
+        """
+        if __debug__:
+            # Type checks are skipped under python -O; callers already coerce their input
+            if not isinstance(amount, (int, float)):
+                raise TypeError("Amount must be a number.")
+            if not isinstance(category, str):
+                raise TypeError("Category must be a string.")
+            if not isinstance(date, datetime.date):
+                raise TypeError("Date must be a datetime.date object.")
+        if not math.isfinite(amount):
+            raise ValueError("Amount must be a finite number.")
         if amount <= 0:
             raise ValueError("Amount must be positive.")
+        # Categories repeat heavily; share one string per name. Interned before any slot is written, since
+        # sys.intern rejects non-strings even when the type checks above are compiled out.
+        category = sys.intern(category)
 
         self.amount = amount
         self.category = category
         self.date = date
         self.description = description
+        self._repr_cache: Optional[str] = None
 
     def __repr__(self) -> str:
         """
-        Returns a string representation of the Expense object.
+        Returns a string representation of the Expense object, built once and cached until the Expense is recycled.
         """
-        return f"Expense(amount={self.amount}, category='{self.category}', date={self.date.isoformat()}, description='{self.description}')"
+        if self._repr_cache is None:
+            self._repr_cache = f"Expense(amount={self.amount}, category='{self.category}', date={self.date.isoformat()}, description='{self.description}')"
+        return self._repr_cache
 
 
 class UserAccount:
@@ -43,6 +83,8 @@ class UserAccount:
     Represents a user's account with their initial balance.
     """
 
+    __slots__ = ("balance",)
+
     def __init__(self, initial_balance: float) -> None:
         """
         Initializes a new UserAccount object.
@@ -52,6 +94,8 @@ class UserAccount:
         """
         if not isinstance(initial_balance, (int, float)):
             raise TypeError("Initial balance must be a number.")
+        if not math.isfinite(initial_balance):
+            raise ValueError("Initial balance must be a finite number.")
         if initial_balance < 0:
             raise ValueError("Initial balance cannot be negative.")
 
@@ -88,10 +132,142 @@ class ExpenseManager:
         Args:
             user_account (UserAccount): The UserAccount object associated with this expense manager.
         """
-        self.expenses: List[Expense] = []
+        self.expenses: List[Expense] = []  # Kept sorted by date
+        # Columns parallel to self.expenses, so range queries and aggregations avoid per-object attribute loads.
+        self._dates: List[datetime.date] = []
+        self._amounts = array("d")
+        # Categories are stored as small integer ids into self._category_names. The id of a category with no
+        # expenses left is freed for reuse, so the table only holds categories currently in use.
+        self._category_ids = array("i")
+        self._category_names: List[Optional[str]] = []
+        self._category_index: Dict[str, int] = {}
+        self._free_category_ids: List[int] = []
+        # All-time totals per category. Categories touched by an insert or removal are marked dirty and re-summed with
+        # math.fsum on the next query, so the totals never drift from a fresh sum over the rows.
+        self._category_totals: Dict[str, float] = {}
+        self._category_counts: Dict[str, int] = {}
+        self._dirty_categories: Set[str] = set()
+        self._expenses_by_id: Dict[int, Expense] = {}
+        self._next_id = 0
         self.user_account = user_account
+        # Bumped on every change to the expenses; part of every cache key.
+        self._version = 0
+        # Reports for the latest (today, version) only, keyed by period, so the cache holds at most three entries.
+        self._report_cache_key: Optional[Tuple[datetime.date, int]] = None
+        self._report_cache: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+    def _invalidate(self) -> None:
+        """
+        Records a change to the expenses, discarding memoized query results.
+        """
+        self._version += 1
+        self._report_cache.clear()
+
+    def _insert(self, expense: Expense) -> None:
+        """
+        Inserts an expense into the date-sorted expense list and its columns.
+        """
+        if not self._dates or expense.date >= self._dates[-1]:
+            # Expenses mostly arrive in date order, so skip the search and the shifting insert
+            self.expenses.append(expense)
+            self._dates.append(expense.date)
+            self._amounts.append(expense.amount)
+            self._category_ids.append(self._category_id(expense.category))
+        else:
+            position = bisect.bisect_right(self._dates, expense.date)
+            self.expenses.insert(position, expense)
+            self._dates.insert(position, expense.date)
+            self._amounts.insert(position, expense.amount)
+            self._category_ids.insert(position, self._category_id(expense.category))
+        self._track_category(expense)
+
+    def _category_id(self, category: str) -> int:
+        """
+        Returns the integer id of a category, assigning a free one to a new category.
+        """
+        category_id = self._category_index.get(category)
+        if category_id is None:
+            if self._free_category_ids:
+                category_id = self._free_category_ids.pop()
+                self._category_names[category_id] = category
+            else:
+                category_id = len(self._category_names)
+                self._category_names.append(category)
+            self._category_index[category] = category_id
+        return category_id
+
+    def _track_category(self, expense: Expense) -> None:
+        """
+        Counts an inserted expense towards its category and marks the category's total dirty.
+        """
+        category = expense.category
+        self._category_counts[category] = self._category_counts.get(category, 0) + 1
+        self._dirty_categories.add(category)
 
-    def add_expense(self, amount: float, category: str, date: datetime.date, description: str = "") -> None:
+    def _remove(self, expense: Expense) -> None:
+        """
+        Removes an expense from the date-sorted expense list and its columns.
+        """
+        position = bisect.bisect_left(self._dates, expense.date)
+        while self.expenses[position] is not expense:
+            position += 1
+        del self.expenses[position]
+        del self._dates[position]
+        del self._amounts[position]
+        del self._category_ids[position]
+
+        category = expense.category
+        if self._category_counts[category] == 1:
+            del self._category_counts[category]
+            category_id = self._category_index.pop(category)
+            self._category_names[category_id] = None
+            self._free_category_ids.append(category_id)
+        else:
+            self._category_counts[category] -= 1
+        self._dirty_categories.add(category)
+
+    def _refresh_category_totals(self) -> Dict[str, float]:
+        """
+        Re-sums the all-time totals of dirty categories in one pass over the columns and returns all totals.
+        """
+        if self._dirty_categories:
+            dirty_ids = {
+                self._category_index[category]: category
+                for category in self._dirty_categories
+                if category in self._category_counts
+            }
+            rows: Dict[str, List[float]] = {category: [] for category in dirty_ids.values()}
+            for amount, category_id in zip(self._amounts, self._category_ids):
+                category = dirty_ids.get(category_id)
+                if category is not None:
+                    rows[category].append(amount)
+            for category in self._dirty_categories:
+                if category in rows:
+                    self._category_totals[category] = math.fsum(rows[category])
+                else:
+                    self._category_totals.pop(category, None)
+            self._dirty_categories.clear()
+        return self._category_totals
+
+    def _period_bounds(self, start_date: datetime.date, end_date: datetime.date) -> Tuple[int, int]:
+        """
+        Returns the slice bounds of the expenses within a given period.
+        """
+        return bisect.bisect_left(self._dates, start_date), bisect.bisect_right(self._dates, end_date)
+
+    def _get_expense(self, expense_id: int) -> Expense:
+        """
+        Looks up an expense by its id.
+
+        Raises:
+            IndexError: If no expense has the given id.
+        """
+        try:
+            return self._expenses_by_id[expense_id]
+        except KeyError:
+            raise IndexError("Invalid expense id.") from None
+
+    def add_expense(self, amount: float, category: str, date: datetime.date, description: str = "") -> int:
         """
         Adds a new expense to the expense list.
 
@@ -101,6 +277,9 @@ class ExpenseManager:
             date (datetime.date): The date of the expense.
             description (str, optional): A description of the expense. Defaults to "".
 
+        Returns:
+            int: The id assigned to the new expense.
+
         Raises:
             ValueError: If the expense amount exceeds the available balance.
         """
@@ -108,55 +287,110 @@ class ExpenseManager:
             raise ValueError("Expense amount exceeds available balance.")
 
         expense = Expense(amount, category, date, description)
-        self.expenses.append(expense)
+        expense.expense_id = self._next_id
+        self._next_id += 1
+        self._insert(expense)
+        self._expenses_by_id[expense.expense_id] = expense
         self.user_account.update_balance(amount)
+        self._invalidate()
+        return expense.expense_id
 
-    def update_expense(self, index: int, amount: float, category: str, date: datetime.date, description: str = "") -> None:
+    def add_expenses(self, rows: Iterable[Tuple]) -> List[int]:
+        """
+        Adds many expenses at once, checking and updating the balance a single time.
+
+        Either all rows are added or none are.
+
+        Args:
+            rows (Iterable[Tuple]): The expenses to add, as (amount, category, date[, description]) tuples.
+
+        Returns:
+            List[int]: The ids assigned to the new expenses, in row order.
+
+        Raises:
+            ValueError: If a row has an invalid value or the total of the expenses exceeds the available balance.
+            TypeError: If a row has the wrong number of fields or a value of the wrong type.
+        """
+        new_expenses = [Expense(*row) for row in rows]
+        if not new_expenses:
+            return []
+
+        total = math.fsum(expense.amount for expense in new_expenses)
+        if total > self.user_account.get_balance():
+            raise ValueError("Total of the expenses exceeds available balance.")
+
+        expense_ids = []
+        for expense in new_expenses:
+            expense.expense_id = self._next_id
+            self._next_id += 1
+            self._expenses_by_id[expense.expense_id] = expense
+            self._track_category(expense)
+            expense_ids.append(expense.expense_id)
+
+        new_expenses.sort(key=lambda expense: expense.date)
+        if not self._dates or new_expenses[0].date >= self._dates[-1]:
+            self.expenses.extend(new_expenses)
+            self._dates.extend(expense.date for expense in new_expenses)
+            self._amounts.extend(expense.amount for expense in new_expenses)
+            self._category_ids.extend(self._category_id(expense.category) for expense in new_expenses)
+        else:
+            # Sorting two concatenated sorted runs is a linear merge for timsort
+            self.expenses.extend(new_expenses)
+            self.expenses.sort(key=lambda expense: expense.date)
+            self._dates = [expense.date for expense in self.expenses]
+            self._amounts = array("d", (expense.amount for expense in self.expenses))
+            self._category_ids = array("i", (self._category_id(expense.category) for expense in self.expenses))
+
+        self.user_account.balance -= total
+        self._invalidate()
+        return expense_ids
+
+    def update_expense(self, expense_id: int, amount: float, category: str, date: datetime.date, description: str = "") -> None:
         """
         Updates an existing expense in the expense list.
 
         Args:
-            index (int): The index of the expense to update.
+            expense_id (int): The id of the expense to update.
             amount (float): The new amount of the expense.
             category (str): The new category of the expense.
             date (datetime.date): The new date of the expense.
             description (str, optional): The new description of the expense. Defaults to "".
 
         Raises:
-            IndexError: If the index is out of range.
+            IndexError: If no expense has the given id.
             ValueError: If the expense amount exceeds the available balance after the update.
         """
-        if not 0 <= index < len(self.expenses):
-            raise IndexError("Invalid expense index.")
-
-        original_expense = self.expenses[index]
-        balance_increase = original_expense.amount
+        expense = self._get_expense(expense_id)
+        balance_increase = expense.amount
         available_balance = self.user_account.get_balance() + balance_increase
 
         if amount > available_balance:
              raise ValueError("Expense amount exceeds available balance after update.")
 
-        self.user_account.update_balance(balance_increase)  # Revert the original expense from balance
-        expense = Expense(amount, category, date, description)
-        self.expenses[index] = expense
-        self.user_account.update_balance(-amount)  # Deduct the new expense amount
+        # Update in place; the expense is taken out of the columns while its date may change
+        self._remove(expense)
+        try:
+            expense.recycle(amount, category, date, description)
+        finally:
+            self._insert(expense)
+        self.user_account.balance += balance_increase - amount  # Revert the original amount and deduct the new one
+        self._invalidate()
 
-    def delete_expense(self, index: int) -> None:
+    def delete_expense(self, expense_id: int) -> None:
         """
         Deletes an expense from the expense list.
 
         Args:
-            index (int): The index of the expense to delete.
+            expense_id (int): The id of the expense to delete.
 
         Raises:
-            IndexError: If the index is out of range.
+            IndexError: If no expense has the given id.
         """
-        if not 0 <= index < len(self.expenses):
-            raise IndexError("Invalid expense index.")
-
-        expense = self.expenses[index]
-        self.user_account.update_balance(expense.amount)  # Restore balance
-        del self.expenses[index]
+        expense = self._get_expense(expense_id)
+        self.user_account.balance += expense.amount  # Restore balance
+        self._remove(expense)
+        del self._expenses_by_id[expense_id]
+        self._invalidate()
 
     def get_expenses_by_period(self, start_date: datetime.date, end_date: datetime.date) -> List[Expense]:
         """
@@ -167,9 +401,36 @@ class ExpenseManager:
             end_date (datetime.date): The end date of the period.
 
         Returns:
-            List[Expense]: A list of Expense objects within the specified period.
+            List[Expense]: A list of Expense objects within the specified period, ordered by date.
+        """
+        lo, hi = self._period_bounds(start_date, end_date)
+        return self.expenses[lo:hi]
+
+    def _aggregate(self, start_date: datetime.date, end_date: datetime.date) -> Tuple[float, Dict[str, float]]:
+        """
+        Computes the total and the per-category totals of a period from the column slices.
+
+        Args:
+            start_date (datetime.date): The start date of the period.
+            end_date (datetime.date): The end date of the period.
+
+        Returns:
+            Tuple[float, Dict[str, float]]: The total expenses and the category breakdown for the period.
         """
-        return [expense for expense in self.expenses if start_date <= expense.date <= end_date]
+        lo, hi = self._period_bounds(start_date, end_date)
+        amounts = self._amounts[lo:hi]
+        # Group by integer category id rather than hashing category names per row; only ids seen in the period appear
+        rows: Dict[int, List[float]] = {}
+        for amount, category_id in zip(amounts, self._category_ids[lo:hi]):
+            category_rows = rows.get(category_id)
+            if category_rows is None:
+                rows[category_id] = [amount]
+            else:
+                category_rows.append(amount)
+        # Sum with math.fsum like the total, in order of first appearance within the period
+        names = self._category_names
+        category_totals = {names[category_id]: math.fsum(category_rows) for category_id, category_rows in rows.items()}
+        return math.fsum(amounts), category_totals
 
     def calculate_total_expenses(self, start_date: datetime.date, end_date: datetime.date) -> float:
         """
@@ -182,8 +443,8 @@ class ExpenseManager:
         Returns:
             float: The total expenses within the specified period.
         """
-        expenses_in_period = self.get_expenses_by_period(start_date, end_date)
-        return sum(expense.amount for expense in expenses_in_period)
+        lo, hi = self._period_bounds(start_date, end_date)
+        return math.fsum(self._amounts[lo:hi])
 
     def get_remaining_balance(self) -> float:
         """
@@ -194,46 +455,57 @@ class ExpenseManager:
         """
         return self.user_account.get_balance()
 
-    def get_expenses_by_category(self, start_date: datetime.date, end_date: datetime.date) -> Dict[str, float]:
+    def get_expenses_by_category(self, start_date: Optional[datetime.date] = None, end_date: Optional[datetime.date] = None) -> Dict[str, float]:
         """
         Categorizes expenses and provides a breakdown of spending by category within a given period.
 
+        If both dates are omitted, the all-time breakdown is returned from cached per-category totals; only categories
+        changed since the last such call are re-summed.
+
         Args:
-            start_date (datetime.date): The start date of the period.
-            end_date (datetime.date): The end date of the period.
+            start_date (datetime.date, optional): The start date of the period. Defaults to None.
+            end_date (datetime.date, optional): The end date of the period. Defaults to None.
 
         Returns:
             Dict[str, float]: A dictionary where keys are expense categories and values are the total expenses for that category.
         """
-        expenses_in_period = self.get_expenses_by_period(start_date, end_date)
-        category_totals: Dict[str, float] = {}
-        for expense in expenses_in_period:
-            category = expense.category
-            amount = expense.amount
-            category_totals[category] = category_totals.get(category, 0) + amount
-        return category_totals
-
-    def generate_report(self, period: str) -> Dict[str, Dict[str, float]]:
+        if start_date is None and end_date is None:
+            return dict(self._refresh_category_totals())
+        if start_date is None:
+            start_date = datetime.date.min
+        if end_date is None:
+            end_date = datetime.date.max
+        return self._aggregate(start_date, end_date)[1]
+
+    def generate_report(self, period: str, today: Optional[datetime.date] = None) -> Dict[str, Dict[str, float]]:
         """
         Generates a report summarizing expenses over weekly, monthly, or yearly periods.
 
+        Reports for the most recent day and version of the expenses are memoized, so the returned dictionary must not
+        be modified.
+
         Args:
             period (str): The period for the report ("weekly", "monthly", or "yearly").
+            today (datetime.date, optional): The date the report is relative to. Defaults to the current date.
 
         Returns:
             Dict[str, Dict[str, float]]: A dictionary where keys are time periods (e.g., "Week 1", "January", "2023") and
             values are dictionaries containing the total expenses and category breakdowns for that period.
         """
-        today = datetime.date.today()
+        if today is None:
+            today = datetime.date.today()
+        key = (today, self._version)
+        if key != self._report_cache_key:
+            self._report_cache.clear()
+            self._report_cache_key = key
+        report_data = self._report_cache.get(period)
+        if report_data is not None:
+            return report_data
+
         if period == "weekly":
             start_date = today - datetime.timedelta(days=today.weekday())
             end_date = start_date + datetime.timedelta(days=6)
-            report_data = {
-                "Weekly Report": {
-                    "total_expenses": self.calculate_total_expenses(start_date, end_date),
-                    "category_breakdown": self.get_expenses_by_category(start_date, end_date),
-                }
-            }
+            title = "Weekly Report"
         elif period == "monthly":
             year = today.year
             month = today.month
@@ -241,33 +513,50 @@ class ExpenseManager:
             next_month = month + 1 if month < 12 else 1
             next_year = year + 1 if month == 12 else year
             end_date = datetime.date(next_year, next_month, 1) - datetime.timedelta(days=1)
-
-            report_data = {
-                "Monthly Report": {
-                    "total_expenses": self.calculate_total_expenses(start_date, end_date),
-                    "category_breakdown": self.get_expenses_by_category(start_date, end_date),
-                }
-            }
+            title = "Monthly Report"
         elif period == "yearly":
             year = today.year
             start_date = datetime.date(year, 1, 1)
             end_date = datetime.date(year, 12, 31)
-            report_data = {
-                "Yearly Report": {
-                    "total_expenses": self.calculate_total_expenses(start_date, end_date),
-                    "category_breakdown": self.get_expenses_by_category(start_date, end_date),
-                }
-            }
+            title = "Yearly Report"
         else:
             raise ValueError("Invalid period.  Must be 'weekly', 'monthly', or 'yearly'.")
 
+        total_expenses, category_breakdown = self._aggregate(start_date, end_date)
+        report_data = self._report_cache[period] = {
+            title: {
+                "total_expenses": total_expenses,
+                "category_breakdown": category_breakdown,
+            }
+        }
         return report_data
 
+    def get_totals_by_period(self, period: str) -> Dict[str, float]:
+        """
+        Calculates the total expenses of every week, month, or year that has expenses, in a single pass.
+
+        Args:
+            period (str): The bucket size ("weekly", "monthly", or "yearly").
+
+        Returns:
+            Dict[str, float]: A dictionary where keys are bucket labels (e.g., "2023-W05", "2023-01", "2023") in
+            chronological order and values are the total expenses for that bucket.
+        """
+        bucket = _PERIOD_BUCKETS.get(period)
+        if bucket is None:
+            raise ValueError("Invalid period.  Must be 'weekly', 'monthly', or 'yearly'.")
+
+        # The columns are sorted by date, so each bucket is one contiguous run.
+        totals: Dict[str, float] = {}
+        for label, rows in groupby(zip(self._dates, self._amounts), key=lambda row: bucket(row[0])):
+            totals[label] = math.fsum(amount for _, amount in rows)
+        return totals
+
     def get_all_expenses(self) -> List[Expense]:
         """
         Returns all the expenses recorded.
 
         Returns:
-            List[Expense]: A list of all Expense objects.
+            List[Expense]: A list of all Expense objects, ordered by date.
         """
         return self.expenses
\ No newline at end of file
@@ -1,261 +1,277 @@
-import unittest
 import datetime
+import unittest
+
+from expenses import ExpenseManager, UserAccount
+
 
+class TestExpenseIds(unittest.TestCase):
+    def setUp(self):
+        self.manager = ExpenseManager(UserAccount(1000))
 
-class Expense:
-    """
-    Represents a single expense entry.
-    """
-
-    def __init__(self, amount: float, category: str, date: datetime.date, description: str = "") -> None:
-        """
-        Initializes a new Expense object.
-
-        Args:
-            amount (float): The amount of the expense.
-            category (str): The category of the expense (e.g., "Food", "Transportation", "Entertainment").
-            date (datetime.date): The date of the expense.
-            description (str, optional): A brief description of the expense. Defaults to "".
-        """
-        if not isinstance(amount, (int, float)):
-            raise TypeError("Amount must be a number.")
-        if not isinstance(category, str):
-            raise TypeError("Category must be a string.")
-        if not isinstance(date, datetime.date):
-            raise TypeError("Date must be a datetime.date object.")
-        if amount <= 0:
-            raise ValueError("Amount must be positive.")
-
-        self.amount = amount
-        self.category = category
-        self.date = date
-        self.description = description
-
-    def __repr__(self) -> str:
-        """
-        Returns a string representation of the Expense object.
-        """
-        return f"Expense(amount={self.amount}, category='{self.category}', date={self.date.isoformat()}, description='{self.description}')"
-
-
-class UserAccount:
-    """
-    Represents a user's account with their initial balance.
-    """
-
-    def __init__(self, initial_balance: float) -> None:
-        """
-        Initializes a new UserAccount object.
-
-        Args:
-            initial_balance (float): The initial balance of the user's account.
-        """
-        if not isinstance(initial_balance, (int, float)):
-            raise TypeError("Initial balance must be a number.")
-        if initial_balance < 0:
-            raise ValueError("Initial balance cannot be negative.")
-
-        self.balance = initial_balance
-
-    def update_balance(self, expense_amount: float) -> None:
-        """
-        Updates the user's balance after an expense.
-
-        Args:
-            expense_amount (float): The amount of the expense to deduct from the balance.
-        """
-        self.balance -= expense_amount
-
-    def get_balance(self) -> float:
-        """
-        Returns the current balance of the user's account.
-
-        Returns:
-            float: The current balance.
-        """
-        return self.balance
-
-
-class ExpenseManager:
-    """
-    Manages expenses for a user, including adding, updating, deleting, and viewing expenses.
-    """
-
-    def __init__(self, user_account: UserAccount) -> None:
-        """
-        Initializes a new ExpenseManager object.
-
-        Args:
-            user_account (UserAccount): The UserAccount object associated with this expense manager.
-        """
-        self.expenses: List[Expense] = []
-        self.user_account = user_account
-
-    def add_expense(self, amount: float, category: str, date: datetime.date, description: str = "") -> None:
-        """
-        Adds a new expense to the expense list.
-
-        Args:
-            amount (float): The amount of the expense.
-            category (str): The category of the expense.
-            date (datetime.date): The date of the expense.
-            description (str, optional): A description of the expense. Defaults to "".
-
-        Raises:
-            ValueError: If the expense amount exceeds the available balance.
-        """
-        if amount > self.user_account.get_balance():
-            raise ValueError("Expense amount exceeds available balance.")
-
-        expense = Expense(amount, category, date, description)
-        self.expenses.append(expense)
-        self.user_account.update_balance(amount)
-
-    def update_expense(self, index: int, amount: float, category: str, date: datetime.date, description: str = "") -> None:
-        """
-        Updates an existing expense in the expense list.
-
-        Args:
-            index (int): The index of the expense to update.
-            amount (float): The new amount of the expense.
-            category (str): The new category of the expense.
-            date (datetime.date): The new date of the expense.
-            description (str, optional): The new description of the expense. Defaults to "".
-
-        Raises:
-            IndexError: If the index is out of range.
-            ValueError: If the expense amount exceeds the available balance after the update.
-        """
-        if not 0 <= index < len(self.expenses):
-            raise IndexError("Invalid expense index.")
-
-        original_expense = self.expenses[index]
-        balance_increase = original_expense.amount
-        available_balance = self.user_account.get_balance() + balance_increase
-
-        if amount > available_balance:
-             raise ValueError("Expense amount exceeds available balance after update.")
-
-        self.user_account.update_balance(balance_increase)  # Revert the original expense from balance
-        expense = Expense(amount, category, date, description)
-        self.expenses[index] = expense
-        self.user_account.update_balance(-amount)  # Deduct the new expense amount
-
-    def delete_expense(self, index: int) -> None:
-        """
-        Deletes an expense from the expense list.
-
-        Args:
-            index (int): The index of the expense to delete.
-
-        Raises:
-            IndexError: If the index is out of range.
-        """
-        if not 0 <= index < len(self.expenses):
-            raise IndexError("Invalid expense index.")
-
-        expense = self.expenses[index]
-        self.user_account.update_balance(expense.amount)  # Restore balance
-        del self.expenses[index]
-
-    def get_expenses_by_period(self, start_date: datetime.date, end_date: datetime.date) -> List[Expense]:
-        """
-        Returns a list of expenses within a given period.
-
-        Args:
-            start_date (datetime.date): The start date of the period.
-            end_date (datetime.date): The end date of the period.
-
-        Returns:
-            List[Expense]: A list of Expense objects within the specified period.
-        """
-        return [expense for expense in self.expenses if start_date <= expense.date <= end_date]
-
-    def calculate_total_expenses(self, start_date: datetime.date, end_date: datetime.date) -> float:
-        """
-        Calculates the total expenses within a given period.
-
-        Args:
-            start_date (datetime.date): The start date of the period.
-            end_date (datetime.date): The end date of the period.
-
-        Returns:
-            float: The total expenses within the specified period.
-        """
-        expenses_in_period = self.get_expenses_by_period(start_date, end_date)
-        return sum(expense.amount for expense in expenses_in_period)
-
-    def get_remaining_balance(self) -> float:
-        """
-        Returns the remaining balance of the user's account.
-
-        Returns:
-            float: The remaining balance.
-        """
-        return self.user_account.get_balance()
-
-    def get_expenses_by_category(self, start_date: datetime.date, end_date: datetime.date) -> Dict[str, float]:
-        """
-        Categorizes expenses and provides a breakdown of spending by category within a given period.
-
-        Args:
-            start_date (datetime.date): The start date of the period.
-            end_date (datetime.date): The end date of the period.
-
-        Returns:
-            Dict[str, float]: A dictionary where keys are expense categories and values are the total expenses for that category.
-        """
-        expenses_in_period = self.get_expenses_by_period(start_date, end_date)
-        category_totals: Dict[str, float] = {}
-        for expense in expenses_in_period:
-            category = expense.category
-            amount = expense.amount
-            category_totals[category] = category_totals.get(category, 0) + amount
-        return category_totals
-
-    def generate_report(self, period: str) -> Dict[str, Dict[str, float]]:
-        """
-        Generates a report summarizing expenses over weekly, monthly, or yearly periods.
-
-        Args:
-            period (str): The period for the report ("weekly", "monthly", or "yearly").
-
-        Returns:
-            Dict[str, Dict[str, float]]: A dictionary where keys are time periods (e.g., "Week 1", "January", "2023") and
-            values are dictionaries containing the total expenses and category breakdowns for that period.
-        """
-        today = datetime.date.today()
-        if period == "weekly":
-            start_date = today - datetime.timedelta(days=today.weekday())
-            end_date = start_date + datetime.timedelta(days=6)
-            report_data = {
-                "Weekly Report": {
-                    "total_expenses": self.calculate_total_expenses(start_date, end_date),
-                    "category_breakdown": self.get_expenses_by_category(start_date, end_date)
-                }
-            }
-        elif period == "monthly":
-            year = today.year
-            month = today.month
-            start_date = datetime.date(year, month, 1)
-            next_month = month + 1 if month < 12 else 1
-            next_year = year + 1 if month == 12 else year
-            end_date = datetime.date(next_year, next_month, 1) - datetime.timedelta(days=1)
-
-            report_data = {
-                "Monthly Report": {
-                    "total_expenses": self.calculate_total_expenses(start_date, end_date),
-                    "category_breakdown": self.get_expenses_by_category(start_date, end_date)
-                }
-            }
-        elif period == "yearly":
-            year = today.year
-            start_date = datetime.date(year, 1, 1)
-            end_date = datetime.date(year, 12, 31)
-            report_data = {
-                "Yearly Report": {
-                    "total_expenses": self.calculate_total_expenses(start_date, end_date),
-                    "category_breakdown": self.get_expenses_by_category(start_date, end_date)
-                }
-            }
-        return report_data
+    def test_add_expense_returns_distinct_ids(self):
+        first = self.manager.add_expense(10, "Food", datetime.date(2024, 1, 1))
+        second = self.manager.add_expense(20, "Food", datetime.date(2024, 1, 1))
+        self.assertNotEqual(first, second)
+
+    def test_ids_stable_across_out_of_order_inserts(self):
+        late = self.manager.add_expense(10, "Food", datetime.date(2024, 3, 1))
+        early = self.manager.add_expense(20, "Rent", datetime.date(2024, 1, 1))
+        middle = self.manager.add_expense(30, "Travel", datetime.date(2024, 2, 1))
+
+        expenses = self.manager.get_all_expenses()
+        self.assertEqual([e.expense_id for e in expenses], [early, middle, late])
+
+        self.manager.update_expense(late, 15, "Food", datetime.date(2023, 12, 1))
+        self.manager.delete_expense(early)
+        by_id = {e.expense_id: e for e in self.manager.get_all_expenses()}
+        self.assertEqual(set(by_id), {late, middle})
+        self.assertEqual(by_id[late].amount, 15)
+        self.assertEqual(by_id[middle].category, "Travel")
+
+    def test_unknown_id_raises_index_error(self):
+        expense_id = self.manager.add_expense(10, "Food", datetime.date(2024, 1, 1))
+        self.manager.delete_expense(expense_id)
+        with self.assertRaises(IndexError):
+            self.manager.delete_expense(expense_id)
+        with self.assertRaises(IndexError):
+            self.manager.update_expense(expense_id, 5, "Food", datetime.date(2024, 1, 1))
+
+
+class TestBalance(unittest.TestCase):
+    def setUp(self):
+        self.manager = ExpenseManager(UserAccount(100))
+
+    def test_update_restores_original_and_deducts_new_amount(self):
+        expense_id = self.manager.add_expense(30, "Food", datetime.date(2024, 1, 1))
+        self.assertEqual(self.manager.get_remaining_balance(), 70)
+
+        self.manager.update_expense(expense_id, 50, "Food", datetime.date(2024, 1, 1))
+        self.assertEqual(self.manager.get_remaining_balance(), 50)
+
+        self.manager.update_expense(expense_id, 10, "Food", datetime.date(2024, 1, 1))
+        self.assertEqual(self.manager.get_remaining_balance(), 90)
+
+    def test_update_may_use_the_original_amount(self):
+        expense_id = self.manager.add_expense(60, "Rent", datetime.date(2024, 1, 1))
+        self.manager.update_expense(expense_id, 100, "Rent", datetime.date(2024, 1, 1))
+        self.assertEqual(self.manager.get_remaining_balance(), 0)
+
+    def test_rejected_update_leaves_balance_unchanged(self):
+        expense_id = self.manager.add_expense(60, "Rent", datetime.date(2024, 1, 1))
+        with self.assertRaises(ValueError):
+            self.manager.update_expense(expense_id, 101, "Rent", datetime.date(2024, 1, 1))
+        self.assertEqual(self.manager.get_remaining_balance(), 40)
+
+    def test_delete_restores_balance(self):
+        first = self.manager.add_expense(30, "Food", datetime.date(2024, 1, 1))
+        self.manager.add_expense(20, "Food", datetime.date(2024, 1, 2))
+        self.manager.delete_expense(first)
+        self.assertEqual(self.manager.get_remaining_balance(), 80)
+
+
+class TestUpdateInPlace(unittest.TestCase):
+    def test_deleted_expense_is_not_reused_by_add(self):
+        manager = ExpenseManager(UserAccount(100))
+        expense_id = manager.add_expense(5, "Food", datetime.date(2024, 1, 1))
+        [held] = manager.get_all_expenses()
+
+        manager.delete_expense(expense_id)
+        manager.add_expense(7, "Travel", datetime.date(2024, 2, 1))
+
+        self.assertEqual((held.amount, held.category, held.expense_id), (5, "Food", expense_id))
+        self.assertIsNot(manager.get_all_expenses()[0], held)
+
+    def test_invalid_update_leaves_expense_and_balance_unchanged(self):
+        manager = ExpenseManager(UserAccount(100))
+        expense_id = manager.add_expense(5, "Food", datetime.date(2024, 1, 1))
+
+        with self.assertRaises(TypeError):
+            manager.update_expense(expense_id, 50, None, datetime.date(2024, 1, 1))
+
+        [expense] = manager.get_all_expenses()
+        self.assertEqual((expense.amount, expense.category), (5, "Food"))
+        self.assertEqual(manager.get_remaining_balance(), 95)
+        self.assertEqual(manager.get_expenses_by_category(), {"Food": 5})
+        self.assertEqual(manager.calculate_total_expenses(datetime.date(2024, 1, 1), datetime.date(2024, 1, 1)), 5)
+
+
+class TestAddExpenses(unittest.TestCase):
+    def setUp(self):
+        self.manager = ExpenseManager(UserAccount(100))
+
+    def test_bulk_add_deducts_total(self):
+        expense_ids = self.manager.add_expenses([
+            (10, "Food", datetime.date(2024, 1, 2), "lunch"),
+            (20, "Rent", datetime.date(2024, 1, 1)),
+        ])
+        self.assertEqual(len(expense_ids), 2)
+        self.assertEqual(self.manager.get_remaining_balance(), 70)
+
+    def test_bulk_add_before_existing_keeps_columns_aligned(self):
+        existing = self.manager.add_expense(5, "Food", datetime.date(2024, 3, 1))
+        imported = self.manager.add_expenses([
+            (3, "Rent", datetime.date(2024, 3, 1)),
+            (2, "Food", datetime.date(2024, 1, 1)),
+            (4, "Bus", datetime.date(2024, 3, 1)),
+        ])
+
+        expenses = self.manager.get_all_expenses()
+        # Equal dates keep insertion order, as single adds do
+        self.assertEqual([e.expense_id for e in expenses], [imported[1], existing, imported[0], imported[2]])
+        self.assertEqual(self.manager._dates, [e.date for e in expenses])
+        self.assertEqual(list(self.manager._amounts), [e.amount for e in expenses])
+
+        self.manager.update_expense(imported[0], 6, "Rent", datetime.date(2023, 12, 1))
+        self.manager.delete_expense(imported[2])
+        self.manager.delete_expense(existing)
+        self.assertEqual([e.expense_id for e in self.manager.get_all_expenses()], [imported[0], imported[1]])
+        self.assertEqual(self.manager.get_remaining_balance(), 92)
+
+    def test_non_finite_amounts_are_rejected(self):
+        for amount in (float("nan"), float("inf")):
+            with self.assertRaises(ValueError):
+                self.manager.add_expenses([(amount, "Food", datetime.date(2024, 1, 1))])
+            with self.assertRaises(ValueError):
+                self.manager.add_expense(amount, "Food", datetime.date(2024, 1, 1))
+        self.assertEqual(self.manager.get_all_expenses(), [])
+        self.assertEqual(self.manager.get_remaining_balance(), 100)
+
+    def test_invalid_row_adds_nothing(self):
+        with self.assertRaises(ValueError):
+            self.manager.add_expenses([
+                (10, "Food", datetime.date(2024, 1, 1)),
+                (-5, "Food", datetime.date(2024, 1, 1)),
+            ])
+        self.assertEqual(self.manager.get_all_expenses(), [])
+        self.assertEqual(self.manager.get_remaining_balance(), 100)
+
+
+class TestReportCache(unittest.TestCase):
+    def setUp(self):
+        self.today = datetime.date(2024, 5, 15)
+        self.manager = ExpenseManager(UserAccount(1000))
+        self.expense_id = self.manager.add_expense(10, "Food", self.today)
+
+    def monthly_total(self):
+        return self.manager.generate_report("monthly", today=self.today)["Monthly Report"]["total_expenses"]
+
+    def test_repeated_report_is_memoized(self):
+        report = self.manager.generate_report("monthly", today=self.today)
+        self.assertIs(self.manager.generate_report("monthly", today=self.today), report)
+
+    def test_mutations_invalidate_reports(self):
+        self.assertEqual(self.monthly_total(), 10)
+        self.manager.add_expense(5, "Food", self.today)
+        self.assertEqual(self.monthly_total(), 15)
+        self.manager.update_expense(self.expense_id, 20, "Food", self.today)
+        self.assertEqual(self.monthly_total(), 25)
+        self.manager.delete_expense(self.expense_id)
+        self.assertEqual(self.monthly_total(), 5)
+        self.manager.add_expenses([(1, "Food", self.today), (2, "Food", self.today)])
+        self.assertEqual(self.monthly_total(), 8)
+
+    def test_cache_only_keeps_latest_day(self):
+        for offset in range(100):
+            self.manager.generate_report("weekly", today=self.today + datetime.timedelta(days=offset))
+        self.assertEqual(len(self.manager._report_cache), 1)
+
+
+class TestTotalsByPeriod(unittest.TestCase):
+    def setUp(self):
+        self.manager = ExpenseManager(UserAccount(1000))
+        # Deliberately inserted out of date order
+        self.manager.add_expense(4, "Food", datetime.date(2025, 2, 3))
+        self.manager.add_expense(1, "Food", datetime.date(2024, 12, 30))
+        self.manager.add_expense(2, "Rent", datetime.date(2025, 1, 5))
+        self.manager.add_expense(8, "Food", datetime.date(2024, 6, 1))
+
+    def test_weekly_uses_iso_weeks_across_year_boundary(self):
+        self.assertEqual(
+            self.manager.get_totals_by_period("weekly"),
+            {"2024-W22": 8, "2025-W01": 3, "2025-W06": 4},
+        )
+
+    def test_monthly_groups_unsorted_inserts(self):
+        totals = self.manager.get_totals_by_period("monthly")
+        self.assertEqual(totals, {"2024-06": 8, "2024-12": 1, "2025-01": 2, "2025-02": 4})
+        self.assertEqual(list(totals), sorted(totals))
+
+    def test_yearly_groups_unsorted_inserts(self):
+        self.assertEqual(self.manager.get_totals_by_period("yearly"), {"2024": 9, "2025": 6})
+
+    def test_unknown_period_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            self.manager.get_totals_by_period("daily")
+
+
+class TestAllTimeCategoryTotals(unittest.TestCase):
+    def setUp(self):
+        self.manager = ExpenseManager(UserAccount(1000))
+
+    def assert_matches_full_range(self):
+        self.assertEqual(
+            self.manager.get_expenses_by_category(),
+            self.manager.get_expenses_by_category(datetime.date.min, datetime.date.max),
+        )
+
+    def test_delete_leaves_no_float_residue(self):
+        first = self.manager.add_expense(0.1, "F", datetime.date(2024, 1, 1))
+        self.manager.add_expense(0.2, "F", datetime.date(2024, 1, 2))
+        self.manager.get_expenses_by_category()
+        self.manager.delete_expense(first)
+        self.assertEqual(self.manager.get_expenses_by_category(), {"F": 0.2})
+        self.assert_matches_full_range()
+
+    def test_matches_full_range_after_updates_and_deletes(self):
+        expense_ids = [
+            self.manager.add_expense(amount, category, datetime.date(2024, 1, day))
+            for day, (amount, category) in enumerate([(0.1, "A"), (0.2, "A"), (0.3, "B"), (0.7, "A"), (1.1, "B")], 1)
+        ]
+        self.manager.update_expense(expense_ids[0], 0.3, "B", datetime.date(2024, 2, 1))
+        self.assert_matches_full_range()
+        self.manager.delete_expense(expense_ids[2])
+        with self.assertRaises(TypeError):
+            self.manager.update_expense(expense_ids[1], 0.4, None, datetime.date(2024, 1, 2))
+        self.assert_matches_full_range()
+        self.manager.delete_expense(expense_ids[3])
+        self.manager.delete_expense(expense_ids[1])
+        self.assertEqual(set(self.manager.get_expenses_by_category()), {"B"})
+        self.assert_matches_full_range()
+
+
+class TestRangedCategoryBreakdown(unittest.TestCase):
+    def setUp(self):
+        self.manager = ExpenseManager(UserAccount(1000))
+
+    def test_breakdown_only_counts_expenses_in_range(self):
+        self.manager.add_expense(7, "Rent", datetime.date(2024, 1, 31))
+        self.manager.add_expense(0.1, "Food", datetime.date(2024, 2, 3))
+        self.manager.add_expense(0.7, "Rent", datetime.date(2024, 2, 1))
+        self.manager.add_expense(0.2, "Food", datetime.date(2024, 2, 2))
+        self.manager.add_expense(9, "Bus", datetime.date(2024, 3, 1))
+
+        breakdown = self.manager.get_expenses_by_category(datetime.date(2024, 2, 1), datetime.date(2024, 2, 29))
+        self.assertEqual(breakdown, {"Rent": 0.7, "Food": 0.30000000000000004})
+        # Categories appear in order of their first expense within the period
+        self.assertEqual(list(breakdown), ["Rent", "Food"])
+
+    def test_total_matches_breakdown(self):
+        for day, amount in enumerate([0.1, 0.2, 0.3], 1):
+            self.manager.add_expense(amount, "Food", datetime.date(2024, 1, day))
+        report = self.manager.generate_report("monthly", today=datetime.date(2024, 1, 15))["Monthly Report"]
+        self.assertEqual(report["total_expenses"], 0.6)
+        self.assertEqual(report["category_breakdown"], {"Food": 0.6})
+
+    def test_deleted_categories_release_their_ids(self):
+        for _ in range(3):
+            expense_id = self.manager.add_expense(1, "Tpyo", datetime.date(2024, 1, 1))
+            self.manager.delete_expense(expense_id)
+        self.manager.add_expense(2, "Food", datetime.date(2024, 1, 1))
+        self.assertEqual(len(self.manager._category_names), 1)
+        self.assertEqual(
+            self.manager.get_expenses_by_category(datetime.date(2024, 1, 1), datetime.date(2024, 1, 1)), {"Food": 2}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()